@@ -4,26 +4,311 @@ Integrado al Sistema Editorial Jurídico Supervisado.
 """
 
 import time
+import atexit
+import queue
+import sqlite3
 import logging
 import re
 import os
+import shutil
+import threading
 import requests
-from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.exceptions import HTTPError as Urllib3HTTPError, ReadTimeoutError
+from pathlib import Path, PurePosixPath
+from urllib.parse import urlparse
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import TYPE_CHECKING, Callable, List, Optional, Dict, Any, Tuple
 from dataclasses import dataclass
-
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from concurrent.futures import ThreadPoolExecutor
 
 from base import BaseExtractor, DocumentMetadata
 
+# selenium y webdriver_manager se importan dentro de los métodos que los usan
+# para que importar el módulo (p. ej. solo por CorteConstitucionalDocument)
+# no pague su coste de carga
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+# Número de sentencia: SU.123/25, SU-123/25, SU123/25, T-343/25, C123/25, A-12/25
+_SENTENCE_RE = re.compile(
+    r'(SU[.\-]?\d{1,4}[/-]\d{2,4}|[TCG]-?\d{1,4}[/-]\d{2,4}|A-\d{1,4}[/-]\d{2,4})',
+    re.IGNORECASE
+)
+
+# URL construida por _generate_document_url (año/identificador normalizado .rtf)
+_GENERATED_URL_RE = re.compile(
+    r'https://www\.corteconstitucional\.gov\.co/sentencias/\d{4}/(?:su-?\d|[tcga]-?\d)[\w-]*\.rtf'
+)
+
+# Nombres de mes en español indexados por número de mes (índice 0 sin uso)
+SPANISH_MONTHS = (
+    "", "enero", "febrero", "marzo", "abril", "mayo", "junio",
+    "julio", "agosto", "septiembre", "octubre", "noviembre", "diciembre"
+)
+
+# Días hábiles revisados en búsqueda normal y extendida (BD vacía o sin resultados)
+NORMAL_SEARCH_DAYS = 5
+EXTENDED_SEARCH_DAYS = 15
+
+# Secciones del sitio donde buscar el botón de últimas sentencias (en orden)
+JURISPRUDENCIA_PATHS = ("/jurisprudencia/", "/relatoria/", "/")
+
+# Textos del botón que lleva al listado de últimas sentencias (en orden de prioridad)
+BUTTON_PATTERNS = (
+    "Ver últimas sentencias",
+    "últimas sentencias",
+    "Últimas sentencias",
+    "Ver sentencias recientes"
+)
+
+# Texto de las primeras filas de tabla en una sola llamada a WebDriver
+_ROW_TEXTS_JS = (
+    "return Array.from(document.querySelectorAll(arguments[0]))"
+    ".slice(0, arguments[1]).map(r => (r.innerText || '').trim());"
+)
+MAX_ROW_PROCESSING = 50
+TABLE_ROW_SELECTORS = ("table tr", "tbody tr")
+
+# Buscar el primer botón/enlace visible cuyo texto contenga alguno de los
+# patrones (en orden de prioridad), hacer clic y devolver su texto junto con
+# el número de filas previo al clic (para detectar el re-render)
+_CLICK_BUTTON_JS = """
+const patterns = arguments[0];
+const candidates = Array.from(document.querySelectorAll('button, a, span'));
+for (const pattern of patterns) {
+    for (const el of candidates) {
+        if (!el.textContent || !el.textContent.includes(pattern)) continue;
+        const clickable = el.closest('button, a');
+        if (!clickable || clickable.disabled) continue;
+        // Visibilidad: offsetParent es null en elementos position:fixed aunque se vean
+        const hidden = typeof clickable.checkVisibility === 'function'
+            ? !clickable.checkVisibility({visibilityProperty: true})
+            : clickable.getClientRects().length === 0;
+        if (hidden) continue;
+        const rows = document.querySelectorAll('tr').length;
+        clickable.scrollIntoView({block: 'center'});
+        clickable.click();
+        return {text: clickable.innerText.trim(), rows: rows};
+    }
+}
+return null;
+"""
+
+# Timeout de descarga (conexión, lectura entre bloques) en segundos
+DOWNLOAD_TIMEOUT = (5, 60)
+
+# Tamaño mínimo (bytes) para considerar válido un documento descargado
+MIN_DOCUMENT_SIZE = 100
+
+# Tamaño de bloque al copiar el cuerpo de una descarga a disco
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# Formatos de documento aceptados: (firma/magic bytes, extensión, subdirectorio)
+DOCUMENT_TYPES = (
+    (b'PK\x03\x04', '.docx', 'docx'),
+    (rb'{\rtf', '.rtf', 'rtf'),
+    (b'%PDF-', '.pdf', 'pdf'),
+    (b'\xd0\xcf\x11\xe0', '.doc', 'doc'),  # Word 97-2003 (OLE)
+)
+DOCUMENT_SIGNATURES = tuple(signature for signature, _, _ in DOCUMENT_TYPES)
+EXTENSION_SUBDIRS = {extension: subdir for _, extension, subdir in DOCUMENT_TYPES}
+
+
+def _detect_document_type(head: bytes) -> Optional[Tuple[str, str]]:
+    """Devolver (extensión, subdirectorio) según la firma del archivo, o None si no se reconoce."""
+    for signature, extension, subdir in DOCUMENT_TYPES:
+        if head.startswith(signature):
+            return extension, subdir
+    return None
+
+# Recursos que no aportan al texto de la tabla y se bloquean vía CDP
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.css",
+    "*google-analytics*", "*googletagmanager*", "*doubleclick*"
+]
+
+# Preferencias de Chrome: no cargar imágenes ni pedir notificaciones
+CHROME_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.default_content_setting_values.notifications": 2
+}
+
+class _ChromeDriverPool:
+    """Pool acotado de drivers de Chrome reutilizables entre extracciones e instancias."""
+    
+    _drivers: "queue.Queue[webdriver.Chrome]" = queue.Queue(maxsize=4)
+    _closed = False
+    
+    @classmethod
+    def get(cls, factory: Callable[[], "webdriver.Chrome"]) -> "webdriver.Chrome":
+        """Tomar un driver del pool o crear uno nuevo con `factory`."""
+        try:
+            return cls._drivers.get_nowait()
+        except queue.Empty:
+            return factory()
+    
+    @classmethod
+    def put(cls, driver: "webdriver.Chrome"):
+        """Limpiar el driver y devolverlo al pool; cerrarlo si el pool está lleno o cerrado."""
+        try:
+            if not cls._closed:
+                driver.delete_all_cookies()
+                driver.get("about:blank")
+                cls._drivers.put_nowait(driver)
+                return
+        except Exception:
+            # Pool lleno o driver en mal estado: no se reutiliza
+            pass
+        
+        try:
+            driver.quit()
+        except Exception:
+            pass
+    
+    @classmethod
+    def drain(cls):
+        """Cerrar todos los drivers del pool al terminar el proceso."""
+        cls._closed = True
+        while True:
+            try:
+                driver = cls._drivers.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+atexit.register(_ChromeDriverPool.drain)
+
+# Ruta de chromedriver resuelta por webdriver_manager, reutilizada durante el TTL
+_CACHED_DRIVER_PATH: Optional[str] = None
+_CACHED_DRIVER_AT = 0.0
+_DRIVER_PATH_TTL = 24 * 3600
+# Entre procesos se reutiliza la ruta persistida en disco durante 7 días
+_DRIVER_PATH_FILE = Path.home() / ".cache" / "juridica-news" / "chromedriver_path"
+_DRIVER_PATH_FILE_TTL = 7 * 24 * 3600
+
+
+def _read_cached_driver_path() -> Optional[str]:
+    """Leer la ruta persistida de chromedriver si es reciente y el binario aún existe."""
+    try:
+        if time.time() - _DRIVER_PATH_FILE.stat().st_mtime >= _DRIVER_PATH_FILE_TTL:
+            return None
+        path = _DRIVER_PATH_FILE.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    return path if path and os.path.isfile(path) else None
+
+
+def _get_driver_path(refresh: bool = False) -> Tuple[str, bool]:
+    """
+    Obtener la ruta de chromedriver sin consultar la red en cada arranque.
+    
+    Args:
+        refresh: Si es True, descarta las rutas en cache y vuelve a ejecutar install()
+        
+    Returns:
+        Tuple[str, bool]: (ruta, True si viene de un cache y puede estar obsoleta)
+    """
+    global _CACHED_DRIVER_PATH, _CACHED_DRIVER_AT
+    
+    env_path = os.environ.get("CHROMEDRIVER_PATH")
+    if env_path:
+        return env_path, False
+    
+    if refresh:
+        _invalidate_driver_path()
+    
+    now = time.time()
+    if _CACHED_DRIVER_PATH and now - _CACHED_DRIVER_AT < _DRIVER_PATH_TTL:
+        return _CACHED_DRIVER_PATH, True
+    
+    path = _read_cached_driver_path()
+    from_cache = path is not None
+    if not path:
+        from webdriver_manager.chrome import ChromeDriverManager
+        
+        path = ChromeDriverManager().install()
+        try:
+            _DRIVER_PATH_FILE.parent.mkdir(parents=True, exist_ok=True)
+            _DRIVER_PATH_FILE.write_text(path, encoding="utf-8")
+        except OSError:
+            pass
+    
+    _CACHED_DRIVER_PATH = path
+    _CACHED_DRIVER_AT = now
+    return path, from_cache
+
+
+def _invalidate_driver_path():
+    """Olvidar la ruta de chromedriver en memoria y en disco (p. ej. tras actualizarse Chrome)."""
+    global _CACHED_DRIVER_PATH, _CACHED_DRIVER_AT
+    
+    _CACHED_DRIVER_PATH = None
+    _CACHED_DRIVER_AT = 0.0
+    try:
+        _DRIVER_PATH_FILE.unlink()
+    except OSError:
+        pass
+
+
+class UrlCache:
+    """Cache persistente (SQLite) de verificaciones de URL con TTL, compartido entre ejecuciones."""
+    
+    def __init__(self, path: Path, ttl: float, logger: Optional[logging.Logger] = None):
+        self.ttl = ttl
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        # Una sola conexión por extractor, usada desde los hilos de verificación
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS url_cache (url TEXT PRIMARY KEY, valid INTEGER NOT NULL, ts REAL NOT NULL)"
+        )
+        self._conn.commit()
+    
+    def get(self, url: str) -> Optional[Tuple[bool, float]]:
+        """Devolver (válida, segundos de vigencia restantes) o None si no hay entrada vigente."""
+        try:
+            with self._lock:
+                row = self._conn.execute("SELECT valid, ts FROM url_cache WHERE url = ?", (url,)).fetchone()
+        except sqlite3.Error as e:
+            # BD bloqueada o con errores de E/S: se trata como fallo de cache
+            self.logger.debug(f"Cache persistente no disponible al leer {url}: {e}")
+            return None
+        if row:
+            remaining = self.ttl - (time.time() - row[1])
+            if remaining > 0:
+                return bool(row[0]), remaining
+        return None
+    
+    def set(self, url: str, valid: bool):
+        """Guardar el resultado de verificar una URL (si falla, se omite)."""
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO url_cache (url, valid, ts) VALUES (?, ?, ?)",
+                    (url, int(valid), time.time())
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                self.logger.debug(f"Cache persistente no disponible al guardar {url}: {e}")
+                try:
+                    self._conn.rollback()
+                except sqlite3.Error:
+                    pass
+    
+    def close(self):
+        """Cerrar la conexión a la base de datos."""
+        with self._lock:
+            self._conn.close()
+
+
 @dataclass
 class CorteConstitucionalDocument(DocumentMetadata):
     """Documento específico de la Corte Constitucional."""
@@ -39,39 +324,113 @@ class CorteConstitucionalDocument(DocumentMetadata):
 class CorteConstitucionalExtractor(BaseExtractor):
     """Extractor completo para la Corte Constitucional integrado al sistema."""
     
-    def __init__(self, download_dir: Optional[str] = None):
+    # Cache de URLs verificadas compartido por todas las instancias del proceso:
+    # url -> (válida, instante de expiración)
+    _url_cache: Dict[str, Tuple[bool, float]] = {}
+    _cache_lock = threading.Lock()
+    _cache_ttl = 3600  # 1 hora en segundos
+    _cache_maxsize = 4096
+    
+    def __init__(self, download_dir: Optional[str] = None, trust_generated_urls: bool = False):
         super().__init__("corte_constitucional")
         self.base_url = "https://www.corteconstitucional.gov.co"
         self.buscador_url = f"{self.base_url}/relatoria/buscador-jurisprudencia"
+        self._jurisprudencia_urls = tuple(f"{self.base_url}{path}" for path in JURISPRUDENCIA_PATHS)
         self.driver = None
         
         # Directorio de descarga configurable
         self.download_dir = Path(download_dir) if download_dir else Path("documents/scraping")
         self.download_dir.mkdir(parents=True, exist_ok=True)
         
-        # Cache de URLs verificadas con timestamp
-        self._url_cache = {}
-        self._cache_ttl = 3600  # 1 hora en segundos
+        # Subdirectorio por formato (rtf, docx, pdf, doc), creados una sola vez
+        self._type_dirs = {subdir: self.download_dir / subdir for _, _, subdir in DOCUMENT_TYPES}
+        for type_dir in self._type_dirs.values():
+            type_dir.mkdir(exist_ok=True)
+        
+        # Hilos para la verificación concurrente de URLs
+        self._verify_workers = 8
+        
+        # Si es True, las URLs con la forma generada no se verifican por red:
+        # la validez se comprueba al descargar y el resultado negativo queda en cache
+        self._trust_generated_urls = trust_generated_urls
+        
+        # Cache persistente de verificaciones (sobrevive entre ejecuciones del script)
+        try:
+            self._url_store: Optional[UrlCache] = UrlCache(self.download_dir / ".url_cache.sqlite", self._cache_ttl, self.logger)
+        except sqlite3.Error as e:
+            self.logger.warning(f"⚠️ Cache persistente de URLs no disponible: {e}")
+            self._url_store = None
+        
+        # Sesión HTTP reutilizable (keep-alive) para verificación y descarga
+        self.http = self._setup_http_session()
         
         # Configurar logging específico para el sistema
         logging.getLogger('selenium').setLevel(logging.WARNING)
         logging.getLogger('urllib3').setLevel(logging.WARNING)
     
-    def __del__(self):
-        """Cleanup del driver al destruir la instancia."""
-        if self.driver:
+    def close(self):
+        """Liberar driver, sesión HTTP y cache persistente (idempotente)."""
+        driver, self.driver = self.driver, None
+        if driver:
+            _ChromeDriverPool.put(driver)
+        
+        http, self.http = self.http, None
+        if http:
             try:
-                self.driver.quit()
-            except:
+                http.close()
+            except Exception:
                 pass
+        
+        url_store, self._url_store = self._url_store, None
+        if url_store:
+            try:
+                url_store.close()
+            except Exception:
+                pass
+    
+    def _require_open(self):
+        """Impedir el uso del extractor después de close()."""
+        if self.http is None:
+            raise RuntimeError("El extractor está cerrado (close() ya fue llamado)")
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def _setup_http_session(self) -> requests.Session:
+        """Crear una sesión HTTP con pool de conexiones y reintentos."""
+        session = requests.Session()
+        # Reintentos a nivel de conexión para errores transitorios; al agotarse se
+        # devuelve la última respuesta para que el llamador decida por su status
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=frozenset({"HEAD", "GET"}),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Accept-Encoding': 'gzip, deflate'
+        })
+        return session
     
     def extract_documents(self, source: str, **kwargs) -> List[DocumentMetadata]:
         """Implementar método abstracto del BaseExtractor."""
         limit = kwargs.get('limit', 10)
         return self.extract_latest_sentences(limit)
     
-    def _setup_driver(self) -> webdriver.Chrome:
+    def _setup_driver(self) -> "webdriver.Chrome":
         """Configurar el driver de Chrome optimizado para el sistema."""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.chrome.options import Options
+        
         self.logger.info("🚗 Configurando driver de Chrome para el sistema")
         
         chrome_options = Options()
@@ -84,21 +443,30 @@ class CorteConstitucionalExtractor(BaseExtractor):
         chrome_options.add_argument("--window-size=1920,1080")
         
         # Optimizaciones de velocidad
-        chrome_options.add_argument("--disable-images")
         chrome_options.add_argument("--disable-plugins")
         chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_experimental_option("prefs", CHROME_PREFS)
         
         # User agent del sistema
         chrome_options.add_argument("--user-agent=SistemaEditorialJuridico/1.0")
         
         try:
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=chrome_options)
+            driver_path, from_cache = _get_driver_path()
+            try:
+                driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+            except Exception as e:
+                if not from_cache:
+                    raise
+                # La ruta en cache ya no sirve (p. ej. Chrome se actualizó): reinstalar una vez
+                self.logger.warning(f"⚠️ chromedriver en cache no válido ({e}), reinstalando...")
+                driver_path, _ = _get_driver_path(refresh=True)
+                driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
             
             driver.set_page_load_timeout(30)
             driver.implicitly_wait(5)
             
             driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            self._block_heavy_resources(driver)
             driver.get("about:blank")
             
             self.logger.info("✅ Driver configurado exitosamente para el sistema")
@@ -112,9 +480,11 @@ class CorteConstitucionalExtractor(BaseExtractor):
                 chrome_options_simple.add_argument("--headless=new")
                 chrome_options_simple.add_argument("--no-sandbox")
                 chrome_options_simple.add_argument("--disable-dev-shm-usage")
+                chrome_options_simple.add_experimental_option("prefs", CHROME_PREFS)
                 
                 driver = webdriver.Chrome(options=chrome_options_simple)
                 driver.set_page_load_timeout(20)
+                self._block_heavy_resources(driver)
                 self.logger.info("✅ Driver configurado con opciones simplificadas")
                 return driver
                 
@@ -122,40 +492,51 @@ class CorteConstitucionalExtractor(BaseExtractor):
                 self.logger.error(f"Error con configuración alternativa: {e2}")
                 raise Exception(f"No se pudo configurar ChromeDriver: {e}")
     
-    def _wait_for_angular_load(self, timeout: int = 15):
-        """Esperar a que Angular termine de cargar."""
+    def _block_heavy_resources(self, driver: "webdriver.Chrome"):
+        """Bloquear imágenes, CSS, fuentes y analítica vía Chrome DevTools Protocol."""
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        except Exception as e:
+            self.logger.debug(f"No se pudo activar el bloqueo de recursos vía CDP: {e}")
+    
+    def _wait_for_angular_load(self, timeout: int = 15, content_timeout: int = 8):
+        """Esperar a que Angular arranque (máx. `timeout`) y renderice contenido (máx. `content_timeout`)."""
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import TimeoutException
+        
+        # Documento listo y aplicación Angular presente (rápido en páginas ya cargadas)
+        angular_js = """
+            return document.readyState === 'complete' && (
+                typeof window.ng !== 'undefined' ||
+                document.querySelector('app-root') !== null ||
+                document.querySelector('[ng-app]') !== null
+            );
+        """
+        # Tabla/resultados renderizados; acotado aparte para no bloquear páginas sin tabla
+        content_js = """
+            return document.querySelector('table') !== null ||
+                document.querySelector('.results') !== null ||
+                document.querySelectorAll('tr').length > 5;
+        """
         try:
             self.logger.debug("⏳ Esperando carga completa de Angular...")
             
-            WebDriverWait(self.driver, timeout).until(
-                lambda driver: driver.execute_script("return document.readyState") == "complete"
-            )
-            
-            WebDriverWait(self.driver, timeout).until(
-                lambda driver: driver.execute_script(
-                    "return typeof window.ng !== 'undefined' || document.querySelector('app-root') !== null || document.querySelector('[ng-app]') !== null"
-                )
+            WebDriverWait(self.driver, timeout, poll_frequency=0.15).until(
+                lambda driver: driver.execute_script(angular_js)
             )
-            
-            # Espera inteligente basada en contenido
-            start_time = time.time()
-            max_content_wait = 8
-            
-            while time.time() - start_time < max_content_wait:
-                content_loaded = self.driver.execute_script("""
-                    return document.querySelector('table') !== null || 
-                           document.querySelector('.results') !== null ||
-                           document.querySelectorAll('tr').length > 5;
-                """)
-                
-                if content_loaded:
-                    self.logger.debug("✅ Contenido dinámico detectado")
-                    return
-                
-                time.sleep(1)
-            
         except TimeoutException:
             self.logger.warning("⚠️ Timeout esperando carga de Angular, continuando...")
+            return
+        
+        try:
+            WebDriverWait(self.driver, content_timeout, poll_frequency=0.15).until(
+                lambda driver: driver.execute_script(content_js)
+            )
+            self.logger.debug("✅ Contenido dinámico detectado")
+        except TimeoutException:
+            # Normal en páginas sin tabla (p. ej. antes del clic en "últimas sentencias")
+            self.logger.debug("Sin tabla/resultados tras la espera de contenido, continuando...")
     
     def extract_latest_sentences(self, limit: int = 10, check_database_empty: bool = True) -> List[DocumentMetadata]:
         """
@@ -180,22 +561,21 @@ class CorteConstitucionalExtractor(BaseExtractor):
                 if use_extended_search:
                     self.logger.info("🗃️ Base de datos vacía detectada - usando búsqueda extendida")
             
+            # La búsqueda normal se amplía a la extendida dentro de la misma pasada
             documents = self._extract_with_date_filtering(limit, use_extended_search=use_extended_search)
             
-            # Si no encontramos documentos con búsqueda normal, intentar extendida
-            if not documents and not use_extended_search:
-                self.logger.info("🔍 Sin resultados con búsqueda normal, intentando búsqueda extendida...")
-                documents = self._extract_with_date_filtering(limit, use_extended_search=True)
-            
             if documents:
                 self.logger.info(f"✅ Extraídas {len(documents)} sentencias")
                 
-                # Validar URLs
+                # Validar URLs en paralelo (I/O de red sobre la sesión compartida)
+                with ThreadPoolExecutor(max_workers=min(self._verify_workers, len(documents))) as executor:
+                    flags = list(executor.map(self._verify_document_url_cached, [doc.pdf_url for doc in documents]))
+                
                 valid_documents = []
-                for doc in documents:
-                    if doc.pdf_url and self._verify_document_url_cached(doc.pdf_url):
+                for doc, is_valid in zip(documents, flags):
+                    if is_valid:
                         valid_documents.append(doc)
-                        self.logger.debug(f"✅ URL verificada: {doc.document_id}")
+                        self.logger.debug("✅ URL verificada: %s", doc.document_id)
                     else:
                         self.logger.warning(f"❌ URL inválida: {doc.document_id}")
                 
@@ -243,26 +623,43 @@ class CorteConstitucionalExtractor(BaseExtractor):
         results = []
         
         try:
-            if not self.driver:
-                self.logger.info("Inicializando driver de Selenium...")
-                self.driver = self._setup_driver()
+            # Driver prestado por el pool solo durante esta extracción
+            self.logger.info("Inicializando driver de Selenium...")
+            self.driver = _ChromeDriverPool.get(self._setup_driver)
             
-            # Obtener fechas de extracción (usar búsqueda extendida si se especifica)
-            extraction_dates = self._get_extraction_dates(extended_search=use_extended_search)
-            self.logger.info(f"🔍 Buscando en {len(extraction_dates)} fechas hábiles")
+            # Se generan siempre las fechas de la búsqueda extendida; en modo normal
+            # solo se pasa de los primeros NORMAL_SEARCH_DAYS si no hubo resultados
+            extraction_dates = self._get_extraction_dates(extended_search=True)
+            normal_days = None if use_extended_search else NORMAL_SEARCH_DAYS
+            if use_extended_search:
+                self.logger.info(f"🗓️ Modo de búsqueda: extendida ({len(extraction_dates)} días hábiles)")
+            else:
+                self.logger.info(
+                    f"🗓️ Modo de búsqueda: normal ({NORMAL_SEARCH_DAYS} días hábiles, "
+                    f"ampliable a {len(extraction_dates)} si no hay resultados)"
+                )
             
             # Navegar a la sección de jurisprudencia
             success = self._navigate_to_jurisprudencia()
             if not success:
                 return []
             
+            # La tabla de últimas sentencias es la misma para todas las fechas:
+            # se lee una vez y cada fecha se filtra en memoria
+            row_groups = self._read_table_rows()
+            
             # Extraer sentencias para cada fecha
-            for date_obj, date_str, date_short, date_alt in extraction_dates:
+            seen = set()
+            for i, (date_obj, date_str, date_short, date_alt) in enumerate(extraction_dates):
                 if len(results) >= limit:
                     break
+                if i == normal_days:
+                    if results:
+                        break
+                    self.logger.info("🔍 Sin resultados con búsqueda normal, ampliando a búsqueda extendida...")
                     
                 self.logger.info(f"📅 Buscando sentencias del {date_str}")
-                date_results = self._extract_sentences_by_date(date_str, date_short, date_alt, limit - len(results))
+                date_results = self._extract_sentences_by_date(date_str, date_short, date_alt, limit - len(results), seen, row_groups)
                 
                 if date_results:
                     self.logger.info(f"✅ {len(date_results)} sentencias encontradas para {date_str}")
@@ -275,6 +672,11 @@ class CorteConstitucionalExtractor(BaseExtractor):
         except Exception as e:
             self.logger.error(f"Error en extracción con filtrado: {e}")
             return []
+        
+        finally:
+            if self.driver:
+                _ChromeDriverPool.put(self.driver)
+                self.driver = None
     
     def _get_extraction_dates(self, extended_search: bool = False) -> List[tuple]:
         """
@@ -283,17 +685,11 @@ class CorteConstitucionalExtractor(BaseExtractor):
         Args:
             extended_search: Si es True, busca en más días (para base de datos limpia)
         """
-        months_spanish = {
-            1: "enero", 2: "febrero", 3: "marzo", 4: "abril", 5: "mayo", 6: "junio",
-            7: "julio", 8: "agosto", 9: "septiembre", 10: "octubre", 11: "noviembre", 12: "diciembre"
-        }
-
         dates_to_extract = []
         today = datetime.now()
 
         # Determinar número de días HÁBILES a buscar
-        target_business_days = 15 if extended_search else 5
-        self.logger.info(f"🗓️ Modo de búsqueda: {'extendida' if extended_search else 'normal'} ({target_business_days} días hábiles)")
+        target_business_days = EXTENDED_SEARCH_DAYS if extended_search else NORMAL_SEARCH_DAYS
 
         current_date = today
         days_added = 0
@@ -301,17 +697,12 @@ class CorteConstitucionalExtractor(BaseExtractor):
         while days_added < target_business_days:
             # Solo incluir días hábiles (lunes-viernes)
             if current_date.weekday() < 5:
-                day = current_date.day
-                month_name = months_spanish[current_date.month]
-                year = current_date.year
-
-                target_date_str = f"{day} de {month_name} de {year}"
-                target_date_short = current_date.strftime("%d/%m/%Y")
-                target_date_alt = f"{day:02d}-{current_date.month:02d}-{year}"
+                target_date_str = f"{current_date.day} de {SPANISH_MONTHS[current_date.month]} de {current_date.year}"
+                target_date_short, target_date_alt = current_date.strftime("%d/%m/%Y|%d-%m-%Y").split("|")
 
                 dates_to_extract.append((current_date, target_date_str, target_date_short, target_date_alt))
                 days_added += 1
-                self.logger.debug(f"📅 Agregada fecha: {target_date_str}")
+                self.logger.debug("📅 Agregada fecha: %s", target_date_str)
 
             current_date -= timedelta(days=1)
 
@@ -320,17 +711,11 @@ class CorteConstitucionalExtractor(BaseExtractor):
     
     def _navigate_to_jurisprudencia(self) -> bool:
         """Navegar a la sección de jurisprudencia."""
-        jurisprudencia_urls = [
-            "https://www.corteconstitucional.gov.co/jurisprudencia/",
-            "https://www.corteconstitucional.gov.co/relatoria/",
-            "https://www.corteconstitucional.gov.co/"
-        ]
-        
-        for base_url in jurisprudencia_urls:
+        for base_url in self._jurisprudencia_urls:
             try:
                 self.logger.info(f"🌐 Navegando a: {base_url}")
+                # driver.get bloquea hasta el evento load; el resto lo espera la sonda de Angular
                 self.driver.get(base_url)
-                time.sleep(3)
                 self._wait_for_angular_load()
                 
                 # Buscar botón "Ver últimas sentencias"
@@ -345,48 +730,67 @@ class CorteConstitucionalExtractor(BaseExtractor):
     
     def _click_ver_ultimas_sentencias(self) -> bool:
         """Buscar y hacer clic en botón 'Ver últimas sentencias'."""
-        button_patterns = [
-            "Ver últimas sentencias",
-            "últimas sentencias", 
-            "Últimas sentencias",
-            "Ver sentencias recientes"
-        ]
-        
-        for pattern in button_patterns:
-            selectors = [
-                f"//button[contains(text(), '{pattern}')]",
-                f"//a[contains(text(), '{pattern}')]",
-                f"//span[contains(text(), '{pattern}')]/parent::button",
-                f"//span[contains(text(), '{pattern}')]/parent::a"
-            ]
-            
-            for selector in selectors:
-                try:
-                    buttons = self.driver.find_elements(By.XPATH, selector)
-                    for button in buttons:
-                        if button.is_displayed() and button.is_enabled():
-                            self.logger.info(f"✅ Encontrado botón: '{button.text.strip()}'")
-                            
-                            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", button)
-                            time.sleep(1)
-                            
-                            try:
-                                button.click()
-                            except:
-                                self.driver.execute_script("arguments[0].click();", button)
-                            
-                            time.sleep(3)
-                            self._wait_for_angular_load()
-                            return True
-                            
-                except Exception as e:
-                    continue
+        try:
+            old_url = self.driver.current_url
+            # Búsqueda, filtro de visibilidad y clic en una sola llamada a WebDriver
+            clicked = self.driver.execute_script(_CLICK_BUTTON_JS, list(BUTTON_PATTERNS))
+        except Exception as e:
+            self.logger.debug(f"Error buscando botón de últimas sentencias: {e}")
+            return False
         
-        return False
+        if clicked is None:
+            return False
+        
+        self.logger.info(f"✅ Encontrado botón: '{clicked['text']}'")
+        self._wait_for_click_effect(old_url, clicked['rows'])
+        self._wait_for_angular_load()
+        return True
     
-    def _extract_sentences_by_date(self, target_date_str: str, target_date_short: str, target_date_alt: str, limit: int) -> List[DocumentMetadata]:
-        """Extraer sentencias filtradas por fecha específica."""
+    def _wait_for_click_effect(self, old_url: str, old_row_count: int, timeout: float = 3):
+        """Esperar a que el clic cambie la URL o re-renderice la tabla (máximo `timeout`)."""
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import TimeoutException
+        
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.15).until(
+                lambda driver: driver.current_url != old_url or
+                driver.execute_script("return document.querySelectorAll('tr').length") != old_row_count
+            )
+        except TimeoutException:
+            self.logger.debug("Sin cambios detectables tras el clic, continuando...")
+    
+    def _read_table_rows(self) -> List[List[str]]:
+        """
+        Leer el texto de las filas de la tabla de resultados, una lista por selector.
+        
+        Solo se incluyen los selectores con más de 2 filas, en orden de preferencia.
+        """
+        row_groups = []
+        for selector in TABLE_ROW_SELECTORS:
+            try:
+                row_texts = self.driver.execute_script(_ROW_TEXTS_JS, selector, MAX_ROW_PROCESSING) or []
+                if len(row_texts) > 2:
+                    row_groups.append(row_texts)
+            except Exception as e:
+                self.logger.debug(f"Error con selector {selector}: {e}")
+        return row_groups
+    
+    def _extract_sentences_by_date(self, target_date_str: str, target_date_short: str, target_date_alt: str, limit: int,
+                                   seen: Optional[set] = None, row_groups: Optional[List[List[str]]] = None) -> List[DocumentMetadata]:
+        """
+        Extraer sentencias filtradas por fecha específica.
+        
+        Args:
+            seen: Números de sentencia ya extraídos (se actualiza); evita duplicados entre fechas
+            row_groups: Filas ya leídas con _read_table_rows; si se omite se leen del driver
+        """
         results = []
+        if seen is None:
+            seen = set()
+        if row_groups is None:
+            row_groups = self._read_table_rows()
+        now = datetime.now()
+        current_year = now.year
         
         try:
             # Crear patrones de fecha para búsqueda
@@ -404,61 +808,42 @@ class CorteConstitucionalExtractor(BaseExtractor):
                 iso_date = f"{year}-{month.zfill(2)}-{day.zfill(2)}"
                 date_patterns.append(iso_date)
             
-            # Buscar en tabla
-            table_selectors = ["//table//tr", "//tbody//tr"]
+            # Una sola alternación (sin mayúsculas) en lugar de N búsquedas por fila
+            date_re = re.compile('|'.join(re.escape(pattern.lower()) for pattern in date_patterns))
             
-            for selector in table_selectors:
+            # Buscar en las filas de la tabla
+            for row_texts in row_groups:
                 try:
-                    rows = self.driver.find_elements(By.XPATH, selector)
-                    if len(rows) <= 2:
-                        continue
-                        
-                    for i, row in enumerate(rows[:50]):
+                    for i, row_text in enumerate(row_texts):
                         try:
-                            row_text = row.text.strip()
                             if not row_text or len(row_text) < 10:
                                 continue
                             
                             # Verificar si la fila contiene la fecha objetivo
-                            date_found = False
-                            for date_pattern in date_patterns:
-                                if date_pattern.lower() in row_text.lower():
-                                    date_found = True
-                                    break
-                            
-                            if not date_found:
+                            if not date_re.search(row_text.lower()):
                                 continue
                             
-                            # Buscar número de sentencia - Patrones mejorados
-                            sentence_patterns = [
-                                r'([TCG]-\d{1,4}[/-]\d{2,4})',  # T-343/25, C-123/25, etc.
-                                r'(SU\.\d{1,4}[/-]\d{2,4})',
-                                r'(SU-\d{1,4}[/-]\d{2,4})', 
-                                r'([A]-\d{1,4}[/-]\d{2,4})',
-                                r'([TCG]\d{1,4}[/-]\d{2,4})',   # Sin guión
-                                r'(SU\d{1,4}[/-]\d{2,4})'      # SU sin punto ni guión
-                            ]
-                            
-                            sentence_number = None
-                            for pattern in sentence_patterns:
-                                matches = re.findall(pattern, row_text, re.IGNORECASE)
-                                if matches:
-                                    sentence_number = matches[0].upper()
-                                    break
+                            # Buscar número de sentencia (patrón precompilado)
+                            match = _SENTENCE_RE.search(row_text)
+                            if not match:
+                                continue
+                            sentence_number = match.group(1).upper()
                             
-                            if not sentence_number:
+                            # Omitir sentencias repetidas (misma sentencia en varias filas/fechas)
+                            if sentence_number in seen:
                                 continue
+                            seen.add(sentence_number)
                             
                             # Generar URLs
-                            pdf_url = self._generate_document_url(sentence_number)
-                            html_url = self._generate_html_url(sentence_number)
+                            pdf_url = self._generate_document_url(sentence_number, current_year)
+                            html_url = self._generate_html_url(sentence_number, current_year)
                             
                             # Crear DocumentMetadata
                             doc = DocumentMetadata(
                                 source='corte_constitucional',
                                 document_id=sentence_number,
                                 title=f"Sentencia {sentence_number} de la Corte Constitucional ({target_date_str})",
-                                date=datetime.now(),
+                                date=now,
                                 court="Corte Constitucional",
                                 document_type=sentence_number.split('-')[0] if '-' in sentence_number else sentence_number.split('.')[0],
                                 pdf_url=pdf_url,
@@ -466,20 +851,20 @@ class CorteConstitucionalExtractor(BaseExtractor):
                             )
                             
                             results.append(doc)
-                            self.logger.debug(f"✅ Sentencia encontrada: {sentence_number}")
+                            self.logger.debug("✅ Sentencia encontrada: %s", sentence_number)
                             
                             if len(results) >= limit:
                                 return results
                                 
                         except Exception as e:
-                            self.logger.debug(f"Error procesando fila {i}: {e}")
+                            self.logger.debug("Error procesando fila %s: %s", i, e)
                             continue
                     
                     if results:
                         break
                         
                 except Exception as e:
-                    self.logger.debug(f"Error con selector {selector}: {e}")
+                    self.logger.debug(f"Error recorriendo filas: {e}")
                     continue
             
             return results
@@ -488,169 +873,259 @@ class CorteConstitucionalExtractor(BaseExtractor):
             self.logger.error(f"Error extrayendo por fecha: {e}")
             return []
     
-    def _generate_document_url(self, sentence_number: str) -> str:
+    def _generate_document_url(self, sentence_number: str, year: Optional[int] = None) -> str:
         """Generar URL del documento RTF/DOCX."""
         try:
-            # Limpiar número de sentencia
-            clean_number = sentence_number.strip().upper()
-            
-            # Casos especiales para SU
-            if clean_number.startswith('SU.'):
-                normalized_id = clean_number.replace('SU.', 'su').replace('/', '-').lower()
-            elif clean_number.startswith('SU'):
-                normalized_id = clean_number.replace('SU', 'su').replace('/', '-').lower()
-            else:
-                # Para T, C, A, etc. mantener formato estándar
-                normalized_id = clean_number.lower().replace('/', '-')
+            # Normalizar: minúsculas y '/' -> '-' (T, C, A, SU comparten formato)
+            normalized_id = sentence_number.strip().lower().replace('/', '-')
             
-            current_year = datetime.now().year
+            # Caso especial: 'SU.123' se publica como 'su123'
+            if normalized_id.startswith('su.'):
+                normalized_id = 'su' + normalized_id[3:]
+            
+            current_year = year or datetime.now().year
             base_url = f"https://www.corteconstitucional.gov.co/sentencias/{current_year}/{normalized_id}.rtf"
             
-            self.logger.debug(f"URL generada: {sentence_number} -> {base_url}")
+            self.logger.debug("URL generada: %s -> %s", sentence_number, base_url)
             return base_url
             
         except Exception as e:
             self.logger.error(f"Error generando URL para {sentence_number}: {e}")
             return ""
     
-    def _generate_html_url(self, sentence_number: str) -> str:
+    def _generate_html_url(self, sentence_number: str, year: Optional[int] = None) -> str:
         """Generar URL de la página HTML de la sentencia."""
-        current_year = datetime.now().year
+        current_year = year or datetime.now().year
         return f"https://www.corteconstitucional.gov.co/relatoria/{current_year}/{sentence_number.replace('/', '-')}.htm"
     
     def _verify_document_url_cached(self, url: str) -> bool:
-        """Verificar URL con cache."""
-        import time
+        """Verificar URL con cache (seguro para uso desde varios hilos)."""
+        if not url:
+            return False
         
-        current_time = time.time()
-        if url in self._url_cache:
-            cached_data = self._url_cache[url]
-            if current_time - cached_data['timestamp'] < self._cache_ttl:
-                return cached_data['valid']
+        now = time.monotonic()
+        with self._cache_lock:
+            cached = self._url_cache.get(url)
+        if cached and now < cached[1]:
+            return cached[0]
         
-        is_valid = self._verify_document_url(url)
+        # Consultar el cache persistente antes de ir a la red
+        stored = self._url_store.get(url) if self._url_store else None
+        if stored:
+            is_valid, ttl = stored
+            self._cache_url_result(url, is_valid, ttl)
+            return is_valid
         
-        self._url_cache[url] = {
-            'valid': is_valid,
-            'timestamp': current_time
-        }
+        if self._trust_generated_urls and _GENERATED_URL_RE.fullmatch(url):
+            return True
         
+        # La petición de red se hace fuera del lock para no serializar los hilos
+        is_valid = self._verify_document_url(url)
+        if is_valid is None:
+            # Error de red: se asume válida pero no se guarda, para reintentar la próxima vez
+            return True
+        self._remember_url_result(url, is_valid)
         return is_valid
     
-    def _verify_document_url(self, url: str) -> bool:
-        """Verificar que una URL de documento sea válida."""
+    def _remember_url_result(self, url: str, is_valid: bool):
+        """Registrar el resultado de una URL en el cache persistente y en memoria."""
+        if self._url_store:
+            self._url_store.set(url, is_valid)
+        self._cache_url_result(url, is_valid, self._cache_ttl)
+    
+    def _cache_url_result(self, url: str, is_valid: bool, ttl: float):
+        """Guardar el resultado en el cache en memoria con su vigencia."""
+        now = time.monotonic()
+        with self._cache_lock:
+            if url not in self._url_cache and len(self._url_cache) >= self._cache_maxsize:
+                self._evict_url_cache(now)
+            self._url_cache[url] = (is_valid, now + ttl)
+    
+    def _evict_url_cache(self, now: float):
+        """Liberar espacio en el cache: primero expirados, si no la entrada más antigua."""
+        expired = [url for url, (_, expires_at) in self._url_cache.items() if expires_at <= now]
+        for url in expired:
+            del self._url_cache[url]
+        if len(self._url_cache) >= self._cache_maxsize:
+            del self._url_cache[next(iter(self._url_cache))]
+    
+    def _verify_document_url(self, url: str) -> Optional[bool]:
+        """Verificar que una URL de documento sea válida (None si no se pudo consultar)."""
         if not url:
             return False
+        # Fuera del try: con la sesión cerrada no debe aplicarse el "asumir válida"
+        self._require_open()
             
         try:
-            # Intentar HEAD request primero
-            response = requests.head(url, timeout=10, allow_redirects=True)
-            
-            # Si HEAD no funciona, intentar GET con rango limitado
-            if response.status_code != 200:
-                try:
-                    headers = {'Range': 'bytes=0-1024'}
-                    response = requests.get(url, timeout=10, headers=headers, allow_redirects=True)
-                except:
-                    pass
-            
-            # Aceptar códigos 200-299
-            if not (200 <= response.status_code < 300):
-                self.logger.debug(f"URL retorna status {response.status_code}: {url}")
-                return False
+            # Un solo GET con rango: confirma existencia y permite leer la firma del archivo.
+            # Sin compresión: los primeros bytes recibidos son los del documento
+            # (urllib3 1.26 devuelve b'' al decodificar solo 8 bytes comprimidos)
+            headers = {'Range': 'bytes=0-1023', 'Accept-Encoding': 'identity'}
+            with self.http.get(url, timeout=10, headers=headers, stream=True, allow_redirects=True) as response:
+                if response.status_code not in (200, 206):
+                    self.logger.debug("URL retorna status %s: %s", response.status_code, url)
+                    return False
+                
+                if response.status_code == 206:
+                    # Cuerpo parcial (≤1 KiB): leerlo completo devuelve la conexión al pool
+                    magic = response.raw.read(decode_content=True)[:8]
+                else:
+                    # 200 con el cuerpo completo: basta la firma, la conexión se descarta
+                    magic = response.raw.read(8, decode_content=True)
             
-            content_type = response.headers.get('content-type', '').lower()
-            
-            # Válido si NO es HTML - Ser más permisivo
-            is_valid_document = (
-                'text/html' not in content_type or  # No es HTML, O
-                'application/rtf' in content_type or
-                'application/vnd.openxmlformats' in content_type or
-                'application/msword' in content_type or
-                'application/pdf' in content_type or
-                'application/octet-stream' in content_type or
-                content_type == '' or
-                'text/plain' in content_type  # RTF a veces se reporta como text/plain
-            )
+            # El servidor responde 200 con HTML para documentos inexistentes:
+            # solo se acepta si los primeros bytes son de RTF, DOCX, PDF o DOC
+            is_valid_document = magic.startswith(DOCUMENT_SIGNATURES)
             
-            self.logger.debug(f"URL válida: {url} (Content-Type: {content_type})")
+            self.logger.debug("URL %s: %s", 'válida' if is_valid_document else 'sin firma de documento', url)
             return is_valid_document
             
         except Exception as e:
             self.logger.debug(f"Error verificando URL {url}: {e}")
-            # En caso de error, asumir que es válida para no perder documentos
-            return True
+            # Resultado desconocido: el llamador decide (no se persiste)
+            return None
+    
+    def _write_download(self, local_path: Path, head: bytes, response: requests.Response) -> int:
+        """
+        Escribir el cuerpo descargado en un `<destino>.*.part` y publicarlo con un rename atómico.
+        
+        Returns:
+            int: Bytes escritos; por debajo de MIN_DOCUMENT_SIZE el archivo se descarta
+        """
+        # Nombre único por proceso e hilo: dos descargas del mismo documento en paralelo
+        # no comparten el temporal; la última en terminar publica un archivo completo
+        tmp_path = local_path.with_name(f"{local_path.name}.{os.getpid()}-{threading.get_ident()}.part")
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            with os.fdopen(fd, 'wb', buffering=DOWNLOAD_CHUNK_SIZE) as f:
+                # Con Content-Encoding el tamaño en disco no coincide con Content-Length
+                content_length = response.headers.get('content-length', '')
+                if (content_length.isdigit() and 'content-encoding' not in response.headers
+                        and hasattr(os, 'posix_fallocate')):
+                    try:
+                        os.posix_fallocate(fd, 0, int(content_length))
+                    except OSError:
+                        pass
+                
+                f.write(head)
+                shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
+                # Recortar lo reservado de más si el cuerpo llegó incompleto
+                f.truncate()
+                file_size = f.tell()
+            
+            if file_size < MIN_DOCUMENT_SIZE:
+                tmp_path.unlink()
+            else:
+                # Nunca queda un archivo truncado con el nombre final
+                os.replace(tmp_path, local_path)
+            return file_size
+            
+        except BaseException:
+            if tmp_path.exists():
+                tmp_path.unlink()
+            raise
     
     def download_document(self, document_url: str, sentence_number: str) -> Optional[str]:
-        """Descargar y guardar documento localmente."""
+        """Descargar y guardar documento localmente (None ante cualquier fallo, nunca lanza)."""
         if not document_url:
             return None
+        if self.http is None:
+            self.logger.error(f"❌ Extractor cerrado: no se puede descargar {document_url}")
+            return None
             
         try:
-            # Crear subdirectorios
-            rtf_dir = self.download_dir / "rtf"
-            docx_dir = self.download_dir / "docx"
-            rtf_dir.mkdir(exist_ok=True)
-            docx_dir.mkdir(exist_ok=True)
-            
             # Determinar nombre de archivo
             safe_name = sentence_number.replace("/", "-")
-            extension = '.rtf' if document_url.endswith('.rtf') else '.docx'
+            # Extensión declarada por la ruta de la URL (ignora query/fragmento)
+            extension = PurePosixPath(urlparse(document_url).path).suffix.lower()
+            if extension not in EXTENSION_SUBDIRS:
+                extension = '.docx'
             filename = f"{safe_name}{extension}"
-            local_path = rtf_dir / filename
-            
-            # Headers para solicitud
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            # Descargar archivo
-            response = requests.get(document_url, headers=headers, timeout=30, stream=True)
-            response.raise_for_status()
-            
-            # Verificar tipo de contenido
-            content_type = response.headers.get('content-type', '').lower()
-            
-            # Detectar HTML
-            content_preview = response.content[:500].decode('utf-8', errors='ignore').lower()
-            is_html = (
-                'text/html' in content_type or
-                '<!doctype html' in content_preview or
-                '<html' in content_preview
-            )
-            
-            if is_html:
-                self.logger.warning(f"URL devuelve HTML: {document_url}")
-                return None
+            local_path = self._type_dirs[EXTENSION_SUBDIRS[extension]] / filename
             
-            # Detectar tipo real por firma
-            first_bytes = response.content[:10]
-            if first_bytes.startswith(b'PK'):
-                actual_extension = '.docx'
-                local_path = docx_dir / f"{safe_name}.docx"
-            elif first_bytes.startswith(b'{\\rtf'):
-                actual_extension = '.rtf'
-                local_path = rtf_dir / f"{safe_name}.rtf"
-            else:
-                # Mantener extensión original
-                pass
-            
-            # Guardar archivo
-            with open(local_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-            
-            file_size = local_path.stat().st_size
+            # Descargar archivo (User-Agent definido en la sesión); el context manager
+            # devuelve la conexión al pool también en errores y salidas anticipadas
+            with self.http.get(document_url, timeout=DOWNLOAD_TIMEOUT, stream=True) as response:
+                if not response.ok:
+                    # Consumir la página de error permite reutilizar la conexión
+                    for _ in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                        pass
+                    response.raise_for_status()
+                
+                # Verificar tipo y tamaño declarados antes de leer el cuerpo
+                content_type = response.headers.get('content-type', '').lower()
+                content_length = response.headers.get('content-length', '')
+                
+                if 'text/html' in content_type:
+                    self.logger.warning(f"URL devuelve HTML: {document_url}")
+                    self._remember_url_result(document_url, False)
+                    return None
+                
+                if content_length.isdigit() and int(content_length) < MIN_DOCUMENT_SIZE:
+                    self.logger.warning(f"Documento demasiado pequeño ({content_length} bytes): {document_url}")
+                    return None
+                
+                # Leer solo la cabecera del cuerpo; el resto se copia directo a disco
+                response.raw.decode_content = True
+                head = response.raw.read(512)
+                
+                # Detectar HTML servido sin Content-Type correcto
+                head_lower = head.lower()
+                is_html = b'<!doctype html' in head_lower or b'<html' in head_lower
+                
+                if is_html:
+                    self.logger.warning(f"URL devuelve HTML: {document_url}")
+                    self._remember_url_result(document_url, False)
+                    return None
+                
+                # Detectar tipo real por firma; solo se cambia la ruta si no coincide con la
+                # extensión declarada (si no se reconoce se mantiene la original)
+                detected = _detect_document_type(head)
+                if detected and detected[0] != extension:
+                    actual_extension, subdir = detected
+                    local_path = self._type_dirs[subdir] / f"{safe_name}{actual_extension}"
+                
+                # Guardar archivo: cabecera ya leída + resto en bloques grandes
+                file_size = self._write_download(local_path, head, response)
             
-            # Verificar tamaño mínimo
-            if file_size < 100:
-                local_path.unlink()
+            # Verificar tamaño mínimo (el archivo ya fue descartado)
+            if file_size < MIN_DOCUMENT_SIZE:
                 return None
             
             self.logger.info(f"✅ Documento descargado: {local_path} ({file_size:,} bytes)")
             return str(local_path)
             
+        except (requests.Timeout, ReadTimeoutError) as e:
+            # ReadTimeoutError: timeout al leer el cuerpo desde response.raw
+            self.logger.error(f"⏱️ Timeout descargando {document_url}: {e}")
+            return None
+        except requests.HTTPError as e:
+            self.logger.error(f"🌐 Error HTTP descargando {document_url}: {e}")
+            if e.response is not None and e.response.status_code in (404, 410):
+                self._remember_url_result(document_url, False)
+            return None
+        except (OSError, requests.RequestException, Urllib3HTTPError) as e:
+            # Urllib3HTTPError: cuerpo truncado o conexión cortada (ProtocolError, IncompleteRead)
+            self.logger.error(f"❌ Error de red/E-S descargando {document_url}: {e}")
+            return None
         except Exception as e:
             self.logger.error(f"Error descargando {document_url}: {e}")
-            return None
\ No newline at end of file
+            return None
+    
+    def download_documents(self, documents: List[Tuple[str, str]], max_workers: int = 8) -> List[Optional[str]]:
+        """
+        Descargar varios documentos en paralelo sobre la sesión HTTP compartida.
+        
+        Args:
+            documents: Pares (document_url, sentence_number)
+            max_workers: Descargas simultáneas como máximo
+            
+        Returns:
+            List[Optional[str]]: Ruta local de cada documento (None si falló), en el mismo orden
+        """
+        if not documents:
+            return []
+        
+        # download_document nunca lanza excepciones: un fallo no cancela el resto
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(documents))) as executor:
+            return list(executor.map(lambda pair: self.download_document(*pair), documents))